@@ -1,5 +1,6 @@
-from .utility import DiscreteVector
-from .algorithms import compute_discrete_path_differentials
-from .gpio import OutputPin, InputPin, RPi3, RPi4
-from .hardware import BasicStepperDriver, ServoMotor, DCMotorDriver, Button, ULN2003, StepperDriver
-from .machines import CoreXY
+from .utility import DiscreteVector, TickScheduler, Completion
+from .algorithms import compute_discrete_path_differentials, compute_discrete_arc_differentials, \
+    compute_discrete_bezier_differentials
+from .gpio import OutputPin, InputPin, PWMMultiplexer, RPi3, RPi4
+from .hardware import BasicStepperDriver, ServoMotor, ServoGroup, DCMotorDriver, Button, ULN2003, StepperDriver
+from .machines import CoreXY, CoreXYSimulator, MachineManager
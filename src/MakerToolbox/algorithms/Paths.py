@@ -1,6 +1,6 @@
 from ..utility import DiscreteVector
-from typing import List
-from math import ceil
+from typing import Iterator, List, Tuple
+from math import ceil, isqrt, sqrt
 
 
 def compute_discrete_path_differentials(start: DiscreteVector, end: DiscreteVector) -> List[DiscreteVector]:
@@ -44,3 +44,184 @@ def compute_discrete_path_differentials(start: DiscreteVector, end: DiscreteVect
         path.append(position_delta)
         prev_position = scaled_vector
     return path
+
+
+def _compute_line_differentials(dx: int, dy: int, dz: int) -> Iterator[DiscreteVector]:
+    """
+    Rasterizes a straight line relative to the origin with integer arithmetic (3D Bresenham).
+
+    Args:
+        dx (int): Change in x.
+        dy (int): Change in y.
+        dz (int): Change in z.
+
+    Yields:
+        DiscreteVector: Unit position differentials along the line.
+    """
+    sx, sy, sz = (dx > 0) - (dx < 0), (dy > 0) - (dy < 0), (dz > 0) - (dz < 0)
+    ax, ay, az = abs(dx), abs(dy), abs(dz)
+    length = max(ax, ay, az)
+    ex = ey = ez = length // 2
+    for _ in range(length):
+        ex -= ax
+        ey -= ay
+        ez -= az
+        step_x = step_y = step_z = 0
+        if ex < 0:
+            ex += length
+            step_x = sx
+        if ey < 0:
+            ey += length
+            step_y = sy
+        if ez < 0:
+            ez += length
+            step_z = sz
+        yield DiscreteVector(step_x, step_y, step_z)
+
+
+def compute_discrete_arc_differentials(
+        start: DiscreteVector,
+        end: DiscreteVector,
+        center: DiscreteVector,
+        clockwise: bool = False
+) -> Iterator[DiscreteVector]:
+    """
+    Computes a discrete circular arc in the xy plane relative to the start position.
+
+    The arc is traced with integer arithmetic only: each step moves to whichever of the two
+    neighbours in the direction of travel lies closest to the circle through the start position,
+    so every position on the path lies within one unit of the ideal arc. Differentials are
+    generated one at a time instead of being collected into a list.
+
+    Args:
+        start (DiscreteVector): The starting position.
+        end (DiscreteVector): The ending position. A full circle is traced if it equals the start.
+        center (DiscreteVector): The center of the arc.
+        clockwise (bool, optional): Direction of travel when viewed from +z. Defaults to False.
+
+    Yields:
+        DiscreteVector: Unit position differentials with a z component of 0.
+
+    Raises:
+        ValueError: If the positions are not in the same xy plane, or start and end are not the same
+            distance from the center.
+    """
+    if not start.z == end.z == center.z:
+        raise ValueError('Arc positions must share the same z coordinate.')
+    x, y = start.x - center.x, start.y - center.y
+    ex, ey = end.x - center.x, end.y - center.y
+    radius_squared = x * x + y * y
+    if radius_squared == 0:
+        raise ValueError('Arc start must differ from the center.')
+    if abs(sqrt(ex * ex + ey * ey) - sqrt(radius_squared)) > 1:
+        raise ValueError('Arc start and end must be the same distance from the center.')
+    sign = -1 if clockwise else 1
+    previous_cross = sign * (x * ey - y * ex)
+    # A full circle takes fewer than 8 steps per unit of radius.
+    for _ in range(8 * (isqrt(radius_squared) + 1)):
+        tx, ty = -sign * y, sign * x
+        sx, sy = (tx > 0) - (tx < 0), (ty > 0) - (ty < 0)
+        if abs(tx) > abs(ty):
+            candidates = ((sx, 0), (sx, sy))
+        elif abs(tx) < abs(ty):
+            candidates = ((0, sy), (sx, sy))
+        else:
+            # Travelling exactly diagonally, either straight neighbour may be closest to the circle.
+            candidates = ((sx, 0), (0, sy), (sx, sy))
+        dx, dy = min(candidates, key=lambda step: abs((x + step[0]) ** 2 + (y + step[1]) ** 2 - radius_squared))
+        x += dx
+        y += dy
+        yield DiscreteVector(dx, dy, 0)
+        if x == ex and y == ey:
+            return
+        cross = sign * (x * ey - y * ex)
+        if previous_cross > 0 >= cross and x * ex + y * ey > 0:
+            # Passed the end without landing on it, which happens when the end is slightly off the circle.
+            break
+        previous_cross = cross
+    yield from _compute_line_differentials(ex - x, ey - y, 0)
+
+
+def _bezier_is_flat(points: List[Tuple[float, float, float]], tolerance: float) -> bool:
+    """
+    Checks if every control point lies within the tolerance of the chord between the end points.
+    """
+    (x0, y0, z0), (xn, yn, zn) = points[0], points[-1]
+    cx, cy, cz = xn - x0, yn - y0, zn - z0
+    chord_squared = cx * cx + cy * cy + cz * cz
+    for x, y, z in points[1:-1]:
+        px, py, pz = x - x0, y - y0, z - z0
+        if chord_squared == 0:
+            distance_squared = px * px + py * py + pz * pz
+        else:
+            # Squared length of the cross product divided by the squared chord length.
+            qx, qy, qz = py * cz - pz * cy, pz * cx - px * cz, px * cy - py * cx
+            distance_squared = (qx * qx + qy * qy + qz * qz) / chord_squared
+        if distance_squared > tolerance * tolerance:
+            return False
+    return True
+
+
+def _split_bezier(
+        points: List[Tuple[float, float, float]]
+) -> Tuple[List[Tuple[float, float, float]], List[Tuple[float, float, float]]]:
+    """
+    Splits a Bézier curve in half using de Casteljau's algorithm.
+    """
+    left = [points[0]]
+    right = [points[-1]]
+    while len(points) > 1:
+        points = [
+            ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2, (a[2] + b[2]) / 2)
+            for a, b in zip(points, points[1:])
+        ]
+        left.append(points[0])
+        right.append(points[-1])
+    right.reverse()
+    return left, right
+
+
+def compute_discrete_bezier_differentials(
+        control_points: List[DiscreteVector],
+        tolerance: float = 0.5
+) -> Iterator[DiscreteVector]:
+    """
+    Computes a discrete quadratic or cubic Bézier curve relative to the first control point.
+
+    The curve is subdivided only where it bends, until each piece is within the tolerance of a
+    straight chord. The chords are then rasterized with integer arithmetic, so every position on
+    the path lies within tolerance + 1 unit of the ideal curve. Differentials are generated one
+    at a time instead of being collected into a list.
+
+    Args:
+        control_points (List[DiscreteVector]): Three (quadratic) or four (cubic) control points.
+            The curve starts at the first and ends at the last.
+        tolerance (float, optional): Maximum distance between a chord and the curve. Defaults to 0.5.
+
+    Yields:
+        DiscreteVector: Unit position differentials.
+
+    Raises:
+        ValueError: If the number of control points is not 3 or 4, or the tolerance is not positive.
+    """
+    if len(control_points) not in (3, 4):
+        raise ValueError('A quadratic Bézier needs 3 control points and a cubic Bézier needs 4.')
+    if tolerance <= 0:
+        raise ValueError('Tolerance must be positive.')
+    origin = control_points[0]
+    position = (0, 0, 0)
+    stack = [[(float(p.x - origin.x), float(p.y - origin.y), float(p.z - origin.z)) for p in control_points]]
+    while stack:
+        points = stack.pop()
+        if not _bezier_is_flat(points, tolerance):
+            left, right = _split_bezier(points)
+            stack.append(right)
+            stack.append(left)
+            continue
+        target = (round(points[-1][0]), round(points[-1][1]), round(points[-1][2]))
+        yield from _compute_line_differentials(
+            target[0] - position[0],
+            target[1] - position[1],
+            target[2] - position[2]
+        )
+        position = target
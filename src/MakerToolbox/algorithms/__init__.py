@@ -1 +1,2 @@
-from .Paths import compute_discrete_path_differentials
+from .Paths import compute_discrete_path_differentials, compute_discrete_arc_differentials, \
+    compute_discrete_bezier_differentials
@@ -17,7 +17,7 @@ corexy: CoreXY = CoreXY(stepper, stepper)
 corexy.north(1)
 
 servo = ServoMotor(RPi4.pwm_pin(18, ServoMotor.DEFAULT_FREQUENCY))
-servo.set_angle(45)
+servo.set_angle(45).wait()
 
 motor = DCMotorDriver(
     RPi4.pwm_pin(18, DCMotorDriver.DEFAULT_FREQUENCY),
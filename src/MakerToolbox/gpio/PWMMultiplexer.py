@@ -0,0 +1,255 @@
+import threading
+from time import monotonic, sleep
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .OutputPin import OutputPin
+from .PWMPin import PWMPin
+
+# An edge is the offset in seconds from the start of the period, the pins to write and the value to write.
+Edge = Tuple[float, List[int], bool]
+
+
+class MultiplexedPWMPin(PWMPin):
+    """
+    PWM pin implementation driven by a PWMMultiplexer.
+    """
+
+    def __init__(self, multiplexer: 'PWMMultiplexer', pin: int, output: OutputPin):
+        super().__init__(pin, multiplexer.get_frequency())
+        self._multiplexer = multiplexer
+        self._output = output
+        self._duty_cycle = 0.0
+
+    def start(self, duty_cycle: float):
+        self._multiplexer._update_channel(self, duty_cycle)
+
+    def change_duty_cycle(self, duty_cycle: float):
+        self._multiplexer._update_channel(self, duty_cycle)
+
+    def change_frequency(self, frequency: int):
+        if frequency != self._multiplexer.get_frequency():
+            raise ValueError('Multiplexed PWM channels share the frequency of their multiplexer.')
+
+    def stop(self):
+        self._multiplexer._remove_channel(self)
+
+
+class PWMMultiplexer:
+    """
+    Software PWM generator that drives many output pins from a single timing loop.
+
+    All channels share one period. Whenever a duty cycle changes, the channels are sorted into one
+    edge schedule for the whole period, with edges closer together than the resolution merged into
+    a single write. Each period, the timing loop raises every active pin at the start of the period
+    and lowers them at their scheduled edges, so the work per period grows with the number of
+    distinct edges rather than with the number of threads.
+
+    If a backend is given, no timing loop is run. The backend is called with the period and the
+    schedule every time the schedule changes, e.g. to load it into a hardware waveform generator.
+    """
+
+    DEFAULT_RESOLUTION = 0.00005
+    DEFAULT_SPIN = 0.0002
+
+    def __init__(
+            self,
+            frequency: int,
+            output_pin: Callable[[int], OutputPin],
+            resolution: float = DEFAULT_RESOLUTION,
+            spin: float = DEFAULT_SPIN,
+            backend: Callable[[float, List[Edge]], None] = None
+    ):
+        """
+        Initializes the multiplexer.
+
+        Args:
+            frequency (int): The PWM frequency shared by all channels.
+            output_pin (callable): Function that returns an output pin given a pin number, e.g. RPi4.output_pin.
+            resolution (float, optional): Edges closer together than this many seconds are written together.
+                Defaults to 50 microseconds.
+            spin (float, optional): The timing loop busy-waits for the last this many seconds before an edge
+                instead of sleeping, trading CPU time for lower jitter. Defaults to 200 microseconds.
+            backend (callable, optional): Receives the period and the schedule whenever it changes instead of
+                running the timing loop. Defaults to None.
+        """
+        self._frequency = frequency
+        self._period = 1.0 / frequency
+        self._output_pin = output_pin
+        self._resolution = resolution
+        self._spin = spin
+        self._backend = backend
+        self._channels: Dict[int, MultiplexedPWMPin] = {}
+        self._condition = threading.Condition()
+        self._dirty = False
+        self._edges: List[Tuple[float, List[OutputPin], bool]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._max_lateness = 0.0
+
+    def get_frequency(self) -> int:
+        """
+        Gets the PWM frequency shared by all channels.
+
+        Returns:
+            int: The frequency in hertz.
+        """
+        return self._frequency
+
+    def get_max_lateness(self) -> float:
+        """
+        Gets the largest delay observed between a scheduled edge and its write.
+
+        Returns:
+            float: The lateness in seconds.
+        """
+        return self._max_lateness
+
+    def channel(self, pin: int) -> PWMPin:
+        """
+        Creates a PWM channel on the given pin.
+
+        Args:
+            pin (int): The pin number.
+
+        Returns:
+            PWMPin: A PWM pin driven by this multiplexer.
+        """
+        return MultiplexedPWMPin(self, pin, self._output_pin(pin))
+
+    def get_schedule(self) -> List[Edge]:
+        """
+        Computes the edge schedule for one period.
+
+        The first edge, at offset 0, raises every channel with a non-zero duty cycle. Channels with a
+        zero duty cycle are lowered at offset 0 and channels at 100% are never lowered.
+
+        Returns:
+            List[Edge]: The edges sorted by offset.
+        """
+        with self._condition:
+            channels = list(self._channels.values())
+        schedule: List[Edge] = [
+            (0.0, [channel._pin for channel in channels if channel._duty_cycle > 0], True),
+            (0.0, [channel._pin for channel in channels if channel._duty_cycle <= 0], False)
+        ]
+        for offset, group in self._group_falling_edges(channels):
+            schedule.append((offset, [channel._pin for channel in group], False))
+        return [edge for edge in schedule if edge[1]]
+
+    def _group_falling_edges(self, channels: List[MultiplexedPWMPin]) -> List[Tuple[float, List[MultiplexedPWMPin]]]:
+        """
+        Sorts the channels that switch within a period by falling edge, merging edges within the resolution.
+        A merged edge falls midway between its earliest and latest edge, so no channel is off by more than
+        half the resolution.
+
+        Args:
+            channels (List[MultiplexedPWMPin]): The channels to schedule.
+
+        Returns:
+            List[Tuple[float, List[MultiplexedPWMPin]]]: Falling edge offsets and the channels falling at each.
+        """
+        switching = sorted(
+            (channel for channel in channels if 0 < channel._duty_cycle < 100),
+            key=lambda channel: channel._duty_cycle
+        )
+        # Each group holds the offset of its earliest edge, the offset of its latest edge and its channels.
+        groups: List[Tuple[float, float, List[MultiplexedPWMPin]]] = []
+        for channel in switching:
+            offset = channel._duty_cycle / 100 * self._period
+            if groups and offset - groups[-1][0] < self._resolution:
+                first, _, group = groups[-1]
+                groups[-1] = (first, offset, group + [channel])
+            else:
+                groups.append((offset, offset, [channel]))
+        return [((first + last) / 2, group) for first, last, group in groups]
+
+    def _update_channel(self, channel: MultiplexedPWMPin, duty_cycle: float):
+        """
+        Records a new duty cycle. The schedule is rebuilt at the start of the next period.
+
+        Args:
+            channel (MultiplexedPWMPin): The channel to update.
+            duty_cycle (float): The new duty cycle between 0 and 100.
+        """
+        duty_cycle = max(min(duty_cycle, 100), 0)
+        with self._condition:
+            if self._channels.get(channel._pin) is channel and channel._duty_cycle == duty_cycle:
+                return
+            channel._duty_cycle = duty_cycle
+            self._channels[channel._pin] = channel
+            self._schedule_changed()
+
+    def _remove_channel(self, channel: MultiplexedPWMPin):
+        """
+        Removes a channel from the schedule and pulls its pin low.
+
+        Args:
+            channel (MultiplexedPWMPin): The channel to remove.
+        """
+        with self._condition:
+            if self._channels.get(channel._pin) is not channel:
+                return
+            del self._channels[channel._pin]
+            channel._output.low()
+            self._schedule_changed()
+
+    def _schedule_changed(self):
+        """
+        Hands the new schedule to the backend, or wakes the timing loop. Must be called while holding the lock.
+        """
+        if self._backend is not None:
+            self._backend(self._period, self.get_schedule())
+            return
+        self._dirty = True
+        if self._thread is None and self._channels:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._condition.notify()
+
+    def _rebuild(self):
+        """
+        Rebuilds the edges run by the timing loop. Pins with a constant level are written once here
+        instead of every period. Must be called while holding the lock.
+        """
+        channels = list(self._channels.values())
+        for channel in channels:
+            if channel._duty_cycle <= 0:
+                channel._output.low()
+            elif channel._duty_cycle >= 100:
+                channel._output.high()
+        rising = [channel._output for channel in channels if 0 < channel._duty_cycle < 100]
+        self._edges = [(0.0, rising, True)] if rising else []
+        for offset, group in self._group_falling_edges(channels):
+            self._edges.append((offset, [channel._output for channel in group], False))
+        self._dirty = False
+
+    def _wait_until(self, deadline: float):
+        remaining = deadline - monotonic()
+        if remaining > self._spin:
+            sleep(remaining - self._spin)
+        while monotonic() < deadline:
+            pass
+
+    def _run(self):
+        period_start = monotonic()
+        while True:
+            with self._condition:
+                if not self._channels:
+                    self._thread = None
+                    return
+                if not self._edges and not self._dirty:
+                    # Every pin has a constant level, so there is nothing to do until a duty cycle changes.
+                    self._condition.wait()
+                    period_start = monotonic()
+                if self._dirty:
+                    self._rebuild()
+                edges = self._edges
+            for offset, outputs, value in edges:
+                deadline = period_start + offset
+                self._wait_until(deadline)
+                for output in outputs:
+                    output.set(value)
+                self._max_lateness = max(self._max_lateness, monotonic() - deadline)
+            period_start += self._period
+            if monotonic() > period_start + self._period:
+                # Fell more than a whole period behind, skip ahead instead of bursting to catch up.
+                period_start = monotonic()
@@ -1,6 +1,7 @@
 from .InputPin import InputPin
 from .OutputPin import OutputPin
 from .PWMPin import PWMPin
+from .PWMMultiplexer import PWMMultiplexer
 
 try:
     # Try importing RPi GPIO package, define placeholder class if import fails.
@@ -137,6 +138,16 @@ class Generic40PinRPi:
         """
         return GenericRPiPWMPin(pin, frequency)
 
+    @staticmethod
+    def pwm_multiplexer(frequency: int) -> PWMMultiplexer:
+        """
+        Use this instead of pwm_pin when driving many PWM channels, as every channel of the
+        multiplexer is driven from one timing loop rather than one thread per pin.
+        :param frequency: The frequency shared by all channels.
+        :return: A PWM multiplexer whose channels are created with PWMMultiplexer.channel.
+        """
+        return PWMMultiplexer(frequency, Generic40PinRPi.output_pin)
+
     @staticmethod
     def cleanup():
         GPIO.cleanup()
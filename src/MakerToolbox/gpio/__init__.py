@@ -1,4 +1,5 @@
 from .InputPin import InputPin
 from .OutputPin import OutputPin
 from .PWMPin import PWMPin
+from .PWMMultiplexer import PWMMultiplexer
 from .RaspberryPi import RPi4, RPi3
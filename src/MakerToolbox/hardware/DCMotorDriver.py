@@ -1,4 +1,24 @@
+import threading
+from typing import Callable, Optional
+
 from ..gpio import PWMPin, OutputPin
+from ..utility import TickScheduler, Completion
+
+# Speeds closer than this are considered equal, so floating point noise from ramping never flips direction.
+_SPEED_EPSILON = 1e-9
+
+
+def _clamp_speed(speed: float) -> float:
+    """
+    Clamps the speed value to the range of -1 to 1.
+
+    Args:
+        speed (float): The speed value.
+
+    Returns:
+        float: The clamped speed value.
+    """
+    return max(min(speed, 1), -1)
 
 
 def _convert_speed_to_duty_cycle(speed: float) -> float:
@@ -17,7 +37,15 @@ def _convert_speed_to_duty_cycle(speed: float) -> float:
 class DCMotorDriver:
     DEFAULT_FREQUENCY = 100
 
-    def __init__(self, pwm: PWMPin, dir_a: OutputPin, dir_b: OutputPin, initial_speed: float = 0.5):
+    def __init__(
+            self,
+            pwm: PWMPin,
+            dir_a: OutputPin,
+            dir_b: OutputPin,
+            initial_speed: float = 0.5,
+            acceleration: float = None,
+            scheduler: TickScheduler = None
+    ):
         """
         Initializes the DC motor driver instance.
 
@@ -27,37 +55,208 @@ class DCMotorDriver:
             dir_b (OutputPin): The GPIO pin object connected to the B input of the motor driver for direction control.
             initial_speed (float, optional): The initial speed of the motor as a float between -1 and 1.
                                              Defaults to 0.5.
+            acceleration (float, optional): The maximum change in speed per second used by set_target_speed.
+                                            If None, target speeds are applied immediately. Defaults to None.
+            scheduler (TickScheduler, optional): The scheduler that runs speed ramps and closed-loop control.
+                                                 Defaults to the shared scheduler.
         """
         self._pwm = pwm
         self._dir_a = dir_a
         self._dir_b = dir_b
-        self.set_speed(0)  # Stop the motor initially
-        self._pwm.start(_convert_speed_to_duty_cycle(initial_speed))
+        self._acceleration = acceleration
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._direction: Optional[int] = None
+        self._duty_cycle: Optional[float] = None
+        self._speed = 0.0
+        self._target_speed = 0.0
+        self._completion: Optional[Completion] = None
+        self._feedback: Optional[Callable[[], float]] = None
+        self._kp = 0.0
+        self._ki = 0.0
+        self._integral = 0.0
+        self._write_direction(0)  # Stop the motor initially
+        self._duty_cycle = _convert_speed_to_duty_cycle(initial_speed)
+        self._pwm.start(self._duty_cycle)
 
-    def set_speed(self, speed: float):
+    def _get_scheduler(self) -> TickScheduler:
+        if self._scheduler is None:
+            self._scheduler = TickScheduler.default()
+        return self._scheduler
+
+    def _write_direction(self, direction: int):
         """
-        Sets the speed of the DC motor.
+        Writes the direction pins, skipping the write if the direction has not changed.
 
         Args:
-            speed (float): The speed of the motor as a float between -1 and 1.
-                           A value of -1 represents maximum speed in reverse direction,
-                           0 stops the motor, and 1 represents maximum speed in forward direction.
+            direction (int): 1 for forward, -1 for reverse and 0 for stopped.
         """
-        if speed > 0:
+        if direction == self._direction:
+            return
+        if direction > 0:
             self._dir_a.low()
             self._dir_b.high()
-        elif speed < 0:
+        elif direction < 0:
             self._dir_a.high()
             self._dir_b.low()
         else:
             self._dir_a.low()
             self._dir_b.low()
+        self._direction = direction
 
+    def _write_speed(self, speed: float):
+        """
+        Writes the direction pins and duty cycle for the given speed, skipping redundant writes.
+
+        Args:
+            speed (float): The speed of the motor as a float between -1 and 1.
+        """
+        if abs(speed) < _SPEED_EPSILON:
+            speed = 0.0
+        self._write_direction((speed > 0) - (speed < 0))
         duty_cycle = _convert_speed_to_duty_cycle(speed)
-        self._pwm.change_duty_cycle(duty_cycle)
+        if duty_cycle != self._duty_cycle:
+            self._pwm.change_duty_cycle(duty_cycle)
+            self._duty_cycle = duty_cycle
+
+    def set_speed(self, speed: float):
+        """
+        Sets the speed of the DC motor immediately, cancelling any ramp in progress.
+
+        Args:
+            speed (float): The speed of the motor as a float between -1 and 1.
+                           A value of -1 represents maximum speed in reverse direction,
+                           0 stops the motor, and 1 represents maximum speed in forward direction.
+        """
+        speed = _clamp_speed(speed)
+        with self._lock:
+            self._speed = speed
+            self._target_speed = speed
+            self._integral = 0.0
+            completion = self._completion
+            self._completion = None
+            self._write_speed(speed)
+        if completion is not None:
+            completion.complete()
+
+    def set_target_speed(self, speed: float) -> Completion:
+        """
+        Ramps the motor towards the given speed at the configured acceleration. Returns immediately.
+
+        Args:
+            speed (float): The target speed of the motor as a float between -1 and 1.
+
+        Returns:
+            Completion: A handle that completes once the target speed has been reached.
+        """
+        completion = Completion()
+        if self._acceleration is None and self._feedback is None:
+            self.set_speed(speed)
+            completion.complete()
+            return completion
+        with self._lock:
+            self._target_speed = _clamp_speed(speed)
+            previous = self._completion
+            self._completion = completion
+        if previous is not None:
+            previous.complete()
+        self._get_scheduler().add(self._update, self._on_update_error)
+        return completion
+
+    def set_feedback(self, measure: Optional[Callable[[], float]], kp: float = 0.5, ki: float = 0.0):
+        """
+        Enables closed-loop speed control using encoder feedback.
+
+        While feedback is set, the scheduler corrects the duty cycle on every tick using a PI
+        controller on the difference between the (ramped) target speed and the measured speed.
+
+        Args:
+            measure (callable): A function returning the measured speed in the same units as
+                set_speed (-1 to 1). Pass None to return to open-loop control.
+            kp (float, optional): Proportional gain. Defaults to 0.5.
+            ki (float, optional): Integral gain. Defaults to 0.
+        """
+        with self._lock:
+            self._feedback = measure
+            self._kp = kp
+            self._ki = ki
+            self._integral = 0.0
+        if measure is not None:
+            self._get_scheduler().add(self._update, self._on_update_error)
+
+    def get_speed(self) -> float:
+        """
+        Gets the current commanded speed, which lags the target speed while ramping.
+
+        Returns:
+            float: The current speed as a float between -1 and 1.
+        """
+        return self._speed
+
+    def get_target_speed(self) -> float:
+        """
+        Gets the speed the motor is ramping towards.
+
+        Returns:
+            float: The target speed as a float between -1 and 1.
+        """
+        return self._target_speed
+
+    def _update(self, dt: float) -> bool:
+        """
+        Advances the speed ramp and closed-loop control by one scheduler tick.
+
+        Args:
+            dt (float): Time in seconds since the previous tick.
+
+        Returns:
+            bool: True while the motor still needs updates, False otherwise.
+        """
+        with self._lock:
+            delta = self._target_speed - self._speed
+            if self._acceleration is not None:
+                max_delta = self._acceleration * dt
+                delta = max(min(delta, max_delta), -max_delta)
+            speed = self._speed + delta
+            if abs(self._target_speed - speed) < _SPEED_EPSILON:
+                speed = self._target_speed
+            elif abs(speed) < _SPEED_EPSILON:
+                speed = 0.0
+            self._speed = speed
+            output = self._speed
+            if self._feedback is not None:
+                error = self._speed - self._feedback()
+                if self._ki:
+                    self._integral = max(min(self._integral + error * dt, 1 / self._ki), -1 / self._ki)
+                output += self._kp * error + self._ki * self._integral
+            self._write_speed(_clamp_speed(output))
+            completion = None
+            if self._speed == self._target_speed:
+                completion = self._completion
+                self._completion = None
+            active = self._speed != self._target_speed or self._feedback is not None
+        if completion is not None:
+            completion.complete()
+        return active
+
+    def _on_update_error(self, error: Exception):
+        """
+        Called by the scheduler when an update raised, e.g. because the feedback function failed.
+        Returns to open-loop control at the current speed and releases any waiters.
+
+        Args:
+            error (Exception): The exception raised by the update.
+        """
+        with self._lock:
+            self._feedback = None
+            self._target_speed = self._speed
+            completion = self._completion
+            self._completion = None
+        if completion is not None:
+            completion.complete()
 
     def stop(self):
         """
-        Stops the motor by setting the speed to 0.
+        Stops the motor immediately by setting the speed to 0.
         """
         self.set_speed(0)
@@ -1,36 +1,376 @@
+import threading
+from typing import Callable, List, Optional
+
 from ..gpio import PWMPin
-from time import sleep
+from ..utility import TickScheduler, Completion
+
+
+def linear(t: float) -> float:
+    """
+    Motion profile that moves at a constant speed.
+
+    Args:
+        t (float): Progress through the motion between 0 and 1.
+
+    Returns:
+        float: Fraction of the angle change to apply.
+    """
+    return t
+
+
+def ease_in_out(t: float) -> float:
+    """
+    Motion profile that accelerates from rest and decelerates to rest (smoothstep).
+
+    Args:
+        t (float): Progress through the motion between 0 and 1.
+
+    Returns:
+        float: Fraction of the angle change to apply.
+    """
+    return t * t * (3 - 2 * t)
+
+
+class _ServoMotion:
+    """
+    State of a single servo motion in progress.
+    """
+
+    def __init__(
+            self,
+            start: float,
+            end: float,
+            duration: float,
+            profile: Callable[[float], float],
+            completion: Optional[Completion],
+            group: Optional['ServoGroup'] = None
+    ):
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.profile = profile
+        self.completion = completion
+        self.group = group
+        self.elapsed = 0.0
 
 
 class ServoMotor:
     """
     Represents a servo motor.
+
+    Angle changes are non-blocking: the pulse width is written immediately (or interpolated by a
+    TickScheduler for sweeps) and a Completion handle is returned that finishes once the servo is
+    expected to have settled.
     """
 
     DEFAULT_FREQUENCY = 50
+    DEFAULT_SECONDS_PER_DEGREE = 0.1 / 60
+    DUTY_CYCLE_DECIMALS = 2
 
-    def __init__(self, pwm: PWMPin):
+    def __init__(
+            self,
+            pwm: PWMPin,
+            seconds_per_degree: float = DEFAULT_SECONDS_PER_DEGREE,
+            scheduler: TickScheduler = None
+    ):
         """
         Initializes the ServoMotor instance.
 
         Args:
             pwm (PWMPin): The PWM pin object that controls the servo motor.
+            seconds_per_degree (float, optional): Time the servo takes to turn one degree, used to estimate
+                settle times. Defaults to 0.1 seconds per 60 degrees.
+            scheduler (TickScheduler, optional): The scheduler that runs sweeps and settle timers. Its rate is
+                the sweep update rate. Defaults to the shared scheduler.
         """
         self._pwm = pwm
+        self._seconds_per_degree = seconds_per_degree
+        self._scheduler = scheduler
         self._has_started = False
+        self._duty_cycle: Optional[float] = None
+        self._angle: Optional[float] = None
+        self._motion: Optional[_ServoMotion] = None
+        self._lock = threading.Lock()
 
-    def set_angle(self, angle: float, delay: float = 1):
+    def _get_scheduler(self) -> TickScheduler:
+        if self._scheduler is None:
+            self._scheduler = TickScheduler.default()
+        return self._scheduler
+
+    def _write_angle(self, angle: float):
         """
-        Sets the servo motor to a specified angle.
+        Writes the duty cycle for the given angle, skipping the write if it would not change the output.
 
         Args:
-            angle (float): The desired angle for the servo motor (0 to 180 degrees).
-            delay (float, optional): The delay in seconds after setting the angle. Defaults to 1 second.
+            angle (float): The angle in degrees.
         """
-        duty_cycle = angle / 18.0 + 2.5
+        self._angle = angle
+        duty_cycle = round(angle / 18.0 + 2.5, self.DUTY_CYCLE_DECIMALS)
         if not self._has_started:
             self._pwm.start(duty_cycle)
             self._has_started = True
-        else:
+        elif duty_cycle != self._duty_cycle:
             self._pwm.change_duty_cycle(duty_cycle)
-        sleep(delay)
+        self._duty_cycle = duty_cycle
+
+    def get_angle(self) -> Optional[float]:
+        """
+        Gets the most recently written angle.
+
+        Returns:
+            float: The angle in degrees, or None if no angle has been set yet.
+        """
+        return self._angle
+
+    def estimate_settle_time(self, angle: float) -> float:
+        """
+        Estimates how long the servo takes to reach the given angle from its current angle.
+
+        Args:
+            angle (float): The target angle in degrees.
+
+        Returns:
+            float: The estimated time in seconds. Assumes a full 180 degree turn if the current angle is unknown.
+        """
+        change = 180 if self._angle is None else abs(angle - self._angle)
+        return change * self._seconds_per_degree
+
+    def _begin_motion(self, motion: _ServoMotion):
+        """
+        Replaces the current motion, releasing waiters of the motion being replaced.
+
+        Must be called while holding the servo lock.
+
+        Args:
+            motion (_ServoMotion): The new motion.
+        """
+        previous = self._motion
+        self._motion = motion
+        if previous is not None and previous.completion is not None:
+            previous.completion.complete()
+
+    def set_angle(self, angle: float, delay: float = None) -> Completion:
+        """
+        Sets the servo motor to a specified angle. Returns immediately.
+
+        Args:
+            angle (float): The desired angle for the servo motor (0 to 180 degrees).
+            delay (float, optional): Time in seconds until the returned handle completes.
+                Defaults to the estimated settle time.
+
+        Returns:
+            Completion: A handle that completes once the servo is expected to have settled.
+        """
+        completion = Completion()
+        with self._lock:
+            duration = self.estimate_settle_time(angle) if delay is None else delay
+            self._write_angle(angle)
+            self._begin_motion(_ServoMotion(angle, angle, duration, linear, completion))
+        self._get_scheduler().add(self._update, self._on_update_error)
+        return completion
+
+    def sweep_to(
+            self,
+            angle: float,
+            duration: float = None,
+            profile: Callable[[float], float] = ease_in_out
+    ) -> Completion:
+        """
+        Smoothly moves the servo to the given angle, interpolating on every scheduler tick. Returns immediately.
+
+        Args:
+            angle (float): The desired angle for the servo motor (0 to 180 degrees).
+            duration (float, optional): Duration of the sweep in seconds. Defaults to the estimated settle time.
+            profile (callable, optional): Maps progress between 0 and 1 to the fraction of the angle change
+                to apply. Defaults to ease_in_out.
+
+        Returns:
+            Completion: A handle that completes once the sweep has finished.
+        """
+        completion = Completion()
+        with self._lock:
+            if duration is None:
+                duration = self.estimate_settle_time(angle)
+            if self._angle is None:
+                # The starting position is unknown, so there is nothing to interpolate from.
+                self._write_angle(angle)
+                self._begin_motion(_ServoMotion(angle, angle, duration, linear, completion))
+            else:
+                self._begin_motion(_ServoMotion(self._angle, angle, duration, profile, completion))
+        self._get_scheduler().add(self._update, self._on_update_error)
+        return completion
+
+    def _advance(self, dt: float, group: Optional['ServoGroup'] = None) -> bool:
+        """
+        Advances the current motion if it belongs to the given group.
+
+        Args:
+            dt (float): Time in seconds since the previous tick.
+            group (ServoGroup, optional): The group driving the motion, or None for an individual motion.
+
+        Returns:
+            bool: True if the motion has finished or was taken over by another caller, False otherwise.
+        """
+        with self._lock:
+            motion = self._motion
+            if motion is None or motion.group is not group:
+                return True
+            motion.elapsed += dt
+            t = 1.0 if motion.duration <= 0 else min(motion.elapsed / motion.duration, 1.0)
+            self._write_angle(motion.start + (motion.end - motion.start) * motion.profile(t))
+            if t < 1.0:
+                return False
+            self._motion = None
+        if motion.completion is not None:
+            motion.completion.complete()
+        return True
+
+    def _update(self, dt: float) -> bool:
+        return not self._advance(dt)
+
+    def _on_update_error(self, error: Exception):
+        """
+        Called by the scheduler when an update raised, e.g. because the motion profile failed.
+        Abandons the current motion and releases its waiters.
+
+        Args:
+            error (Exception): The exception raised by the update.
+        """
+        with self._lock:
+            motion = self._motion
+            if motion is None or motion.group is not None:
+                return
+            self._motion = None
+        if motion.completion is not None:
+            motion.completion.complete()
+
+
+class ServoGroup:
+    """
+    Drives several servo motors from a single scheduler task so their motions stay in step.
+    """
+
+    def __init__(self, servos: List[ServoMotor], scheduler: TickScheduler = None):
+        """
+        Initializes the servo group.
+
+        Args:
+            servos (List[ServoMotor]): The servos in the group.
+            scheduler (TickScheduler, optional): The scheduler that runs the group. Its rate is the sweep
+                update rate. Defaults to the shared scheduler.
+        """
+        self._servos = servos
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._active: List[ServoMotor] = []
+        self._completion: Optional[Completion] = None
+
+    def _get_scheduler(self) -> TickScheduler:
+        if self._scheduler is None:
+            self._scheduler = TickScheduler.default()
+        return self._scheduler
+
+    def _begin(self, motions: List[_ServoMotion], write: bool = False) -> Completion:
+        """
+        Starts a group motion, releasing waiters of the group motion being replaced.
+
+        Args:
+            motions (List[_ServoMotion]): The new motion of each servo, in group order.
+            write (bool, optional): If True, each servo's end angle is written as the motion is installed.
+                Defaults to False.
+
+        Returns:
+            Completion: A handle that completes once every motion has finished.
+        """
+        completion = Completion()
+        with self._lock:
+            # Every motion is installed before the servos are published as active, so a tick running
+            # concurrently never sees an active servo without its new motion.
+            for servo, motion in zip(self._servos, motions):
+                with servo._lock:
+                    if write:
+                        servo._write_angle(motion.end)
+                    servo._begin_motion(motion)
+            previous = self._completion
+            self._completion = completion
+            self._active = list(self._servos)
+        if previous is not None:
+            previous.complete()
+        self._get_scheduler().add(self._update, self._on_update_error)
+        return completion
+
+    def set_angles(self, angles: List[float], delay: float = None) -> Completion:
+        """
+        Sets every servo in the group to its angle. Returns immediately.
+
+        Args:
+            angles (List[float]): The desired angle for each servo, in group order.
+            delay (float, optional): Time in seconds until the returned handle completes.
+                Defaults to the longest estimated settle time in the group.
+
+        Returns:
+            Completion: A handle that completes once every servo is expected to have settled.
+        """
+        if len(angles) != len(self._servos):
+            raise ValueError('Expected one angle per servo.')
+        if delay is None:
+            delay = max(servo.estimate_settle_time(angle) for servo, angle in zip(self._servos, angles))
+        return self._begin([_ServoMotion(angle, angle, delay, linear, None, self) for angle in angles], write=True)
+
+    def sweep_to(
+            self,
+            angles: List[float],
+            duration: float = None,
+            profile: Callable[[float], float] = ease_in_out
+    ) -> Completion:
+        """
+        Smoothly moves every servo in the group to its angle so that all of them arrive together. Returns immediately.
+
+        Args:
+            angles (List[float]): The desired angle for each servo, in group order.
+            duration (float, optional): Duration of the sweep in seconds.
+                Defaults to the longest estimated settle time in the group.
+            profile (callable, optional): Maps progress between 0 and 1 to the fraction of the angle change
+                to apply. Defaults to ease_in_out.
+
+        Returns:
+            Completion: A handle that completes once the sweep has finished.
+        """
+        if len(angles) != len(self._servos):
+            raise ValueError('Expected one angle per servo.')
+        if duration is None:
+            duration = max(servo.estimate_settle_time(angle) for servo, angle in zip(self._servos, angles))
+        motions = []
+        for servo, angle in zip(self._servos, angles):
+            start = angle if servo.get_angle() is None else servo.get_angle()
+            motions.append(_ServoMotion(start, angle, duration, profile, None, self))
+        return self._begin(motions)
+
+    def _update(self, dt: float) -> bool:
+        with self._lock:
+            self._active = [servo for servo in self._active if not servo._advance(dt, self)]
+            if self._active:
+                return True
+            completion = self._completion
+            self._completion = None
+        if completion is not None:
+            completion.complete()
+        return False
+
+    def _on_update_error(self, error: Exception):
+        """
+        Called by the scheduler when an update raised. Abandons the group motion and releases its waiters.
+
+        Args:
+            error (Exception): The exception raised by the update.
+        """
+        with self._lock:
+            for servo in self._active:
+                with servo._lock:
+                    if servo._motion is not None and servo._motion.group is self:
+                        servo._motion = None
+            self._active = []
+            completion = self._completion
+            self._completion = None
+        if completion is not None:
+            completion.complete()
@@ -1,6 +1,6 @@
 from time import sleep
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List
 
 from ..gpio import OutputPin
 
@@ -24,6 +24,26 @@ class StepperDriver(ABC):
             direction (bool, optional): The direction of the steps, uses the currently set direction if set to None.
             True for forward, False for backward. Defaults to None.
         """
+        for delay in self.step_pulses(num_steps, delay_func, direction):
+            sleep(delay)
+
+    def step_pulses(self, num_steps: int = 1, delay_func: callable = None, direction: bool = None) -> Iterator[float]:
+        """
+        Generates the pulse stream for a number of steps without sleeping.
+
+        Each iteration performs one step phase and yields the delay in seconds to wait before the next
+        one. The direction is set when the first phase is generated. Used by step, and by callers that
+        schedule pulses themselves.
+
+        Args:
+            num_steps (int, optional): The number of steps to perform. Defaults to 1.
+            delay_func (callable, optional): A function that calculates the delay between steps. Defaults to None.
+            direction (bool, optional): The direction of the steps, uses the currently set direction if set to None.
+            True for forward, False for backward. Defaults to None.
+
+        Yields:
+            float: The delay in seconds after each step phase.
+        """
         if delay_func is None:
             delay_func = self._delay_func
         if direction is not None:
@@ -32,7 +52,7 @@ class StepperDriver(ABC):
             delay = delay_func(x, num_steps)
             for phase in self._step_phases:
                 phase()
-                sleep(delay)
+                yield delay
 
     @staticmethod
     def move(steppers: List['StepperDriver'], num_steps: int = 1, delay_func: callable = None):
@@ -44,6 +64,22 @@ class StepperDriver(ABC):
             num_steps (int, optional): The number of steps to perform. Defaults to 1.
             delay_func (callable, optional): A function that calculates the delay between steps.
         """
+        for delay in StepperDriver.move_pulses(steppers, num_steps, delay_func):
+            sleep(delay)
+
+    @staticmethod
+    def move_pulses(steppers: List['StepperDriver'], num_steps: int = 1, delay_func: callable = None) -> Iterator[float]:
+        """
+        Generates the pulse stream for moving multiple stepper motors simultaneously without sleeping.
+
+        Args:
+            steppers (List['StepperDriver']): A list of stepper motor drivers.
+            num_steps (int, optional): The number of steps to perform. Defaults to 1.
+            delay_func (callable, optional): A function that calculates the delay between steps.
+
+        Yields:
+            float: The delay in seconds after each step phase.
+        """
         phase_counts = [len(stepper._step_phases) for stepper in steppers]
         assert max(phase_counts) == min(phase_counts)
         num_phases = max(phase_counts)
@@ -52,7 +88,7 @@ class StepperDriver(ABC):
             for x in range(num_phases):
                 for stepper in steppers:
                     stepper._step_phases[x]()
-                sleep(delay)
+                yield delay
 
     @abstractmethod
     def set_direction(self, value: bool):
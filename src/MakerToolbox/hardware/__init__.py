@@ -1,4 +1,4 @@
 from .StepperDrivers import BasicStepperDriver, ULN2003, StepperDriver
-from .ServoMotor import ServoMotor
+from .ServoMotor import ServoMotor, ServoGroup
 from .DCMotorDriver import DCMotorDriver
 from .Button import Button
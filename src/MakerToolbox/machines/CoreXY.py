@@ -1,6 +1,8 @@
-from typing import List
+from time import sleep
+from typing import Iterable, Iterator, List
 
 from ..hardware import BasicStepperDriver, StepperDriver
+from ..utility import DiscreteVector
 
 
 class CoreXY:
@@ -44,6 +46,20 @@ class CoreXY:
                 it should take two arguments: current step and total steps,
                 and return the delay time in seconds for the current step.
         """
+        for delay in self.move_y_pulses(steps, delay_func):
+            sleep(delay)
+
+    def move_y_pulses(self, steps: int, delay_func: callable = None) -> Iterator[float]:
+        """
+        Generates the pulse stream for moving along the y axis without sleeping.
+
+        Args:
+            steps (int): Number of steps to move north.
+            delay_func (callable, optional): Custom delay function, see move_y.
+
+        Yields:
+            float: The delay in seconds after each step phase.
+        """
         if steps == 0:
             return
         if steps > 0:
@@ -52,7 +68,7 @@ class CoreXY:
         else:
             self._stepper_a.set_direction(False)
             self._stepper_b.set_direction(True)
-        StepperDriver.move([self._stepper_a, self._stepper_b], abs(steps), delay_func)
+        yield from StepperDriver.move_pulses([self._stepper_a, self._stepper_b], abs(steps), delay_func)
 
     def move_x(self, steps: int, delay_func: callable = None):
         """
@@ -64,6 +80,20 @@ class CoreXY:
                 it should take two arguments: current step and total steps,
                 and return the delay time in seconds for the current step.
         """
+        for delay in self.move_x_pulses(steps, delay_func):
+            sleep(delay)
+
+    def move_x_pulses(self, steps: int, delay_func: callable = None) -> Iterator[float]:
+        """
+        Generates the pulse stream for moving along the x axis without sleeping.
+
+        Args:
+            steps (int): Number of steps to move.
+            delay_func (callable, optional): Custom delay function, see move_x.
+
+        Yields:
+            float: The delay in seconds after each step phase.
+        """
         if steps == 0:
             return
         if steps > 0:
@@ -72,9 +102,31 @@ class CoreXY:
         else:
             self._stepper_a.set_direction(True)
             self._stepper_b.set_direction(True)
-        StepperDriver.move([self._stepper_a, self._stepper_b], abs(steps), delay_func)
+        yield from StepperDriver.move_pulses([self._stepper_a, self._stepper_b], abs(steps), delay_func)
 
     def move_diagonally(self, steps: int, x_direction: int, y_direction: int, delay_func: callable = None):
+        for delay in self.move_diagonally_pulses(steps, x_direction, y_direction, delay_func):
+            sleep(delay)
+
+    def move_diagonally_pulses(
+            self,
+            steps: int,
+            x_direction: int,
+            y_direction: int,
+            delay_func: callable = None
+    ) -> Iterator[float]:
+        """
+        Generates the pulse stream for a diagonal move without sleeping.
+
+        Args:
+            steps (int): Number of steps to move along each axis.
+            x_direction (int): Sign of the x component of the move.
+            y_direction (int): Sign of the y component of the move.
+            delay_func (callable, optional): Custom delay function, see move_x.
+
+        Yields:
+            float: The delay in seconds after each step phase.
+        """
         if steps == 0 or x_direction == 0 or y_direction == 0:
             return
         stepper: StepperDriver
@@ -92,5 +144,66 @@ class CoreXY:
             else:
                 stepper = self._stepper_b
                 self._stepper_b.set_direction(True)
-        stepper.step(2 * steps, delay_func)
+        yield from stepper.step_pulses(2 * steps, delay_func)
+
+    def follow_path(self, differentials: Iterable[DiscreteVector], delay_func: callable = None):
+        """
+        Moves the machine along a path of unit position differentials, such as those computed by
+        compute_discrete_arc_differentials or compute_discrete_bezier_differentials.
+
+        Args:
+            differentials (Iterable[DiscreteVector]): Unit xy position differentials.
+            delay_func (callable, optional): Custom delay function. If provided,
+                it should take two arguments: current differential and total differentials,
+                and return the delay time in seconds for the current differential.
+        """
+        for delay in self.follow_path_pulses(differentials, delay_func):
+            sleep(delay)
+
+    def follow_path_pulses(
+            self,
+            differentials: Iterable[DiscreteVector],
+            delay_func: callable = None
+    ) -> Iterator[float]:
+        """
+        Generates the pulse stream for following a path without sleeping.
+
+        Differentials are consumed one at a time, so generated paths are never held in memory unless a
+        delay function is given and the path has no length, in which case it is collected first to
+        provide the total. Direction pins are only written when the direction changes.
 
+        Args:
+            differentials (Iterable[DiscreteVector]): Unit xy position differentials.
+            delay_func (callable, optional): Custom delay function, see follow_path.
+
+        Yields:
+            float: The delay in seconds after each step phase.
+
+        Raises:
+            ValueError: If a differential is not a unit step in the xy plane.
+        """
+        if delay_func is not None and not hasattr(differentials, '__len__'):
+            differentials = list(differentials)
+        total = len(differentials) if delay_func is not None else 0
+        stepper_a, stepper_b = self._stepper_a, self._stepper_b
+        assert len(stepper_a._step_phases) == len(stepper_b._step_phases)
+        direction_a = direction_b = None
+        for current, differential in enumerate(differentials):
+            movement = self._xy_delta_to_stepper_movement.get((differential.x, differential.y))
+            if movement is None or differential.z != 0:
+                raise ValueError(f'{differential} is not a unit step in the xy plane.')
+            steps_a, steps_b = movement
+            if steps_a != 0 and (steps_a > 0) != direction_a:
+                direction_a = steps_a > 0
+                stepper_a.set_direction(direction_a)
+            if steps_b != 0 and (steps_b > 0) != direction_b:
+                direction_b = steps_b > 0
+                stepper_b.set_direction(direction_b)
+            delay = delay_func(current, total) if delay_func is not None else 0.003
+            for _ in range(max(abs(steps_a), abs(steps_b))):
+                for x in range(len(stepper_a._step_phases)):
+                    if steps_a != 0:
+                        stepper_a._step_phases[x]()
+                    if steps_b != 0:
+                        stepper_b._step_phases[x]()
+                    yield delay
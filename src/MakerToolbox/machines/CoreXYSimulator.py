@@ -0,0 +1,400 @@
+from array import array
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from ..hardware import StepperDriver
+from ..utility import DiscreteVector
+from .CoreXY import CoreXY
+
+# The motors that step, with their directions, for each pair of motor A and motor B step directions.
+_MOVING_MOTORS = {
+    (steps_a, steps_b): tuple((motor, direction) for motor, direction in ((0, steps_a), (1, steps_b)) if direction)
+    for steps_a in (-1, 0, 1) for steps_b in (-1, 0, 1)
+}
+
+
+class SimulatedStepperDriver(StepperDriver):
+    """
+    Stepper driver that counts steps instead of driving GPIO.
+
+    Has the same two phases as a BasicStepperDriver, with the step taken on the second phase.
+    """
+
+    def __init__(self, delay_func: callable = lambda current, total: 0.003):
+        super().__init__(delay_func)
+        self._direction = False
+        self._position = 0
+        self._step_phases = [
+            self._idle,
+            self._advance
+        ]
+
+    def _idle(self):
+        pass
+
+    def _advance(self):
+        self._position += 1 if self._direction else -1
+
+    def set_direction(self, value: bool):
+        self._direction = value
+
+    def get_direction(self) -> bool:
+        return self._direction
+
+    def get_position(self) -> int:
+        """
+        Gets the number of steps taken forward minus the number of steps taken backward.
+
+        Returns:
+            int: The motor position in steps.
+        """
+        return self._position
+
+
+class SimulatedSegment:
+    """
+    Record of a single motion command executed by a CoreXYSimulator.
+
+    Attributes:
+        method (str): Name of the CoreXY method that was called.
+        args (tuple): Arguments the method was called with.
+        start_time (float): Virtual time in seconds at the start of the segment.
+        end_time (float): Virtual time in seconds at the end of the segment.
+        start (Tuple[float, float]): Cartesian position at the start of the segment.
+        end (Tuple[float, float]): Cartesian position at the end of the segment.
+        peak_step_rate (float): Highest step rate of either motor in steps per second.
+        at_risk (bool): True if the segment exceeds the step rate or acceleration limits and may lose steps.
+    """
+
+    def __init__(self, method: str, args: tuple, start_time: float, start: Tuple[float, float]):
+        self.method = method
+        self.args = args
+        self.start_time = start_time
+        self.end_time = start_time
+        self.start = start
+        self.end = start
+        self.peak_step_rate = 0.0
+        self.at_risk = False
+
+    def duration(self) -> float:
+        """
+        Returns:
+            float: The duration of the segment in seconds.
+        """
+        return self.end_time - self.start_time
+
+
+class CoreXYSimulator:
+    """
+    Executes CoreXY jobs on virtual time without sleeping or touching GPIO.
+
+    The simulator has the same motion methods as CoreXY and executes them with the step timing of the
+    CoreXY pulse streams, adding up the delays instead of sleeping. It tracks the motor and Cartesian
+    positions, the exact job duration, segments that risk losing steps, and the trajectory. Every segment
+    is recorded so the job can be replayed on a real CoreXY afterwards.
+
+    A job is any function that takes a CoreXY-like object and calls its motion methods.
+    """
+
+    DEFAULT_MAX_STEP_RATE = 1000
+    DEFAULT_MAX_START_RATE = 250
+    DEFAULT_MAX_ACCELERATION = 5000
+
+    def __init__(
+            self,
+            delay_func: callable = lambda current, total: 0.003,
+            max_step_rate: float = DEFAULT_MAX_STEP_RATE,
+            max_start_rate: float = DEFAULT_MAX_START_RATE,
+            max_acceleration: float = DEFAULT_MAX_ACCELERATION,
+            record_steps: bool = False
+    ):
+        """
+        Initializes the simulator.
+
+        Args:
+            delay_func (callable, optional): Default delay function of the simulated stepper drivers.
+                Should match the drivers of the real machine.
+            max_step_rate (float, optional): Step rate in steps per second above which steps may be lost.
+            max_start_rate (float, optional): Highest step rate a motor can start at, stop from or reverse at
+                without accelerating.
+            max_acceleration (float, optional): Highest change in step rate above the start rate, in steps per
+                second squared.
+            record_steps (bool, optional): If True, the trajectory contains a point for every step instead
+                of one point per segment. Defaults to False.
+        """
+        self._stepper_a = SimulatedStepperDriver(delay_func)
+        self._stepper_b = SimulatedStepperDriver(delay_func)
+        self._corexy = CoreXY(self._stepper_a, self._stepper_b)
+        self._max_step_rate = max_step_rate
+        self._max_start_rate = max_start_rate
+        self._max_acceleration = max_acceleration
+        self._record_steps = record_steps
+        self._time = 0.0
+        self._segments: List[SimulatedSegment] = []
+        self._trajectory = array('d', [0.0, 0.0, 0.0])
+
+    def move_x(self, steps: int, delay_func: callable = None):
+        self._run_segment('move_x', (steps, delay_func), self._line_moves((1, 0), steps, delay_func))
+
+    def move_y(self, steps: int, delay_func: callable = None):
+        self._run_segment('move_y', (steps, delay_func), self._line_moves((0, 1), steps, delay_func))
+
+    def move_diagonally(self, steps: int, x_direction: int, y_direction: int, delay_func: callable = None):
+        moves = ()
+        if steps > 0 and x_direction != 0 and y_direction != 0:
+            # One motor makes two steps per diagonal step, see CoreXY.move_diagonally_pulses.
+            direction = ((x_direction > 0) - (x_direction < 0), (y_direction > 0) - (y_direction < 0))
+            moves = self._line_moves(direction, 2 * steps, delay_func or self._stepper_a._delay_func, 2)
+        self._run_segment('move_diagonally', (steps, x_direction, y_direction, delay_func), moves)
+
+    def follow_path(self, differentials: Iterable[DiscreteVector], delay_func: callable = None):
+        # Collected so the segment can be replayed.
+        differentials = list(differentials)
+        self._run_segment('follow_path', (differentials, delay_func), self._path_moves(differentials, delay_func))
+
+    def _line_moves(
+            self,
+            direction: Tuple[int, int],
+            steps: int,
+            delay_func: callable,
+            scale: int = 1
+    ) -> Iterator[Tuple[float, int, int, int]]:
+        """
+        Generates the step cycles of a straight move, as CoreXY.move_x_pulses, move_y_pulses and
+        move_diagonally_pulses would execute them.
+
+        Args:
+            direction (Tuple[int, int]): Unit xy direction of a positive move.
+            steps (int): Number of step cycles, negative to move against the direction.
+            delay_func (callable): Delay function of the move, or None for the CoreXY default.
+            scale (int, optional): Number of motor steps the movement map gives for the direction. Defaults to 1.
+
+        Yields:
+            Tuple[float, int, int, int]: The delay of each phase, the step direction of motor A and motor B, and
+                the number of step cycles.
+        """
+        steps_a, steps_b = self._corexy._xy_delta_to_stepper_movement[direction]
+        if steps < 0:
+            steps, steps_a, steps_b = -steps, -steps_a, -steps_b
+        steps_a //= scale
+        steps_b //= scale
+        for current in range(steps):
+            yield delay_func(current, steps) if delay_func is not None else 0.003, steps_a, steps_b, 1
+
+    def _path_moves(
+            self,
+            differentials: List[DiscreteVector],
+            delay_func: callable
+    ) -> Iterator[Tuple[float, int, int, int]]:
+        """
+        Generates the step cycles of a path, as CoreXY.follow_path_pulses would execute them.
+
+        Args:
+            differentials (List[DiscreteVector]): Unit xy position differentials.
+            delay_func (callable): Delay function of the path, or None for the CoreXY default.
+
+        Yields:
+            Tuple[float, int, int, int]: The delay of each phase, the step direction of motor A and motor B, and
+                the number of step cycles.
+
+        Raises:
+            ValueError: If a differential is not a unit step in the xy plane.
+        """
+        movements = self._corexy._xy_delta_to_stepper_movement
+        total = len(differentials)
+        for current, differential in enumerate(differentials):
+            movement = movements.get((differential.x, differential.y))
+            if movement is None or differential.z != 0:
+                raise ValueError(f'{differential} is not a unit step in the xy plane.')
+            steps_a, steps_b = movement
+            if movement == (0, 0):
+                continue
+            delay = delay_func(current, total) if delay_func is not None else 0.003
+            yield (
+                delay,
+                (steps_a > 0) - (steps_a < 0),
+                (steps_b > 0) - (steps_b < 0),
+                max(abs(steps_a), abs(steps_b))
+            )
+
+    def run(self, job: Callable[['CoreXYSimulator'], None]) -> 'CoreXYSimulator':
+        """
+        Runs a job on the simulator.
+
+        Args:
+            job (callable): Function that takes the simulator in place of a CoreXY and performs moves on it.
+
+        Returns:
+            CoreXYSimulator: The simulator, for chaining.
+        """
+        job(self)
+        return self
+
+    def replay(self, machine: CoreXY):
+        """
+        Executes every recorded segment on a machine, in order.
+
+        Args:
+            machine (CoreXY): The machine to run the segments on.
+        """
+        for segment in self._segments:
+            getattr(machine, segment.method)(*segment.args)
+
+    def reset(self):
+        """
+        Clears the recorded job and returns the simulator to the origin at time 0.
+        """
+        self._stepper_a._position = 0
+        self._stepper_b._position = 0
+        self._time = 0.0
+        self._segments = []
+        self._trajectory = array('d', [0.0, 0.0, 0.0])
+
+    def get_time(self) -> float:
+        """
+        Returns:
+            float: Virtual time in seconds spent executing the job so far.
+        """
+        return self._time
+
+    def get_motor_positions(self) -> Tuple[int, int]:
+        """
+        Returns:
+            Tuple[int, int]: Positions of motor A and motor B in steps.
+        """
+        return self._stepper_a.get_position(), self._stepper_b.get_position()
+
+    def get_position(self) -> Tuple[float, float]:
+        """
+        Returns:
+            Tuple[float, float]: The Cartesian position in steps.
+        """
+        return self._cartesian(self._stepper_a._position, self._stepper_b._position)
+
+    def get_segments(self) -> List[SimulatedSegment]:
+        """
+        Returns:
+            List[SimulatedSegment]: Every segment executed so far.
+        """
+        return self._segments
+
+    def get_risky_segments(self) -> List[SimulatedSegment]:
+        """
+        Returns:
+            List[SimulatedSegment]: Segments that exceed the step rate or acceleration limits.
+        """
+        return [segment for segment in self._segments if segment.at_risk]
+
+    def get_trajectory(self) -> array:
+        """
+        Returns the trajectory as a flat array of (time, x, y) triples, starting at the origin at time 0.
+
+        Returns:
+            array: The trajectory, with one triple per segment, or per step if record_steps is set.
+        """
+        return self._trajectory
+
+    @staticmethod
+    def _cartesian(a: int, b: int) -> Tuple[float, float]:
+        return -(a + b) / 2, (a - b) / 2
+
+    def _run_segment(self, method: str, args: tuple, moves: Iterable[Tuple[float, int, int, int]]):
+        """
+        Executes the step cycles of a motion command on virtual time, recording the segment.
+
+        A step cycle has the two phases of a SimulatedStepperDriver, each followed by the delay, with the
+        steps taken on the second phase. This is the timing of the pulse streams generated by CoreXY, counted
+        per step instead of per phase.
+
+        A motor starts every segment from rest, and is expected to come to rest by the end of it. Within the
+        start rate a motor can change speed or reverse instantly, the rate above it has to be reached within
+        the acceleration limit.
+
+        Args:
+            method (str): Name of the CoreXY method.
+            args (tuple): Arguments of the method.
+            moves (Iterable[Tuple[float, int, int, int]]): The delay of each phase, the step direction of
+                motor A and motor B, and the number of step cycles.
+        """
+        positions = [self._stepper_a._position, self._stepper_b._position]
+        segment = SimulatedSegment(method, args, self._time, self.get_position())
+        max_start_rate = self._max_start_rate
+        max_acceleration = self._max_acceleration
+        max_step_rate = self._max_step_rate
+        phases = len(self._stepper_a._step_phases)
+        # Time of the previous step of each motor within this segment, and the part of its signed step
+        # rate above the start rate, or None while the motor has not made two steps yet.
+        last_step = [None, None]
+        last_excess = [None, None]
+        # Runs of equal delays are multiplied out rather than summed one by one, which is both faster
+        # and keeps the accumulated time exact for constant delay functions.
+        base = self._time
+        run_delay = 0.0
+        run_count = 0
+
+        def execute(delay: float, steps_a: int, steps_b: int, cycles: int):
+            nonlocal base, run_delay, run_count
+            if delay != run_delay:
+                base += run_delay * run_count
+                run_delay = delay
+                run_count = 0
+            moving = _MOVING_MOTORS[steps_a, steps_b]
+            # After the first two steps of a run every step has the same interval, so there is nothing
+            # left to check and the rest of the run is counted rather than stepped.
+            checked = cycles if self._record_steps else min(cycles, 2)
+            for _ in range(checked):
+                t = base + run_delay * (run_count + phases - 1)
+                run_count += phases
+                for motor, direction in moving:
+                    positions[motor] += direction
+                    previous = last_step[motor]
+                    last_step[motor] = t
+                    if previous is None:
+                        continue
+                    interval = t - previous
+                    rate = 1 / interval if interval > 0 else float('inf')
+                    if rate > segment.peak_step_rate:
+                        segment.peak_step_rate = rate
+                    excess = rate - max_start_rate if rate > max_start_rate else 0.0
+                    if direction < 0:
+                        excess = -excess
+                    if last_excess[motor] is None:
+                        limit_exceeded = excess != 0
+                    else:
+                        limit_exceeded = abs(excess - last_excess[motor]) > max_acceleration * interval
+                    if limit_exceeded or rate > max_step_rate:
+                        segment.at_risk = True
+                    last_excess[motor] = excess
+                if self._record_steps:
+                    self._trajectory.extend((t, *self._cartesian(*positions)))
+            skipped = cycles - checked
+            if skipped:
+                run_count += phases * skipped
+                for motor, direction in moving:
+                    positions[motor] += direction * skipped
+                    last_step[motor] = base + run_delay * (run_count - 1)
+
+        # Consecutive step cycles with the same delay and directions are executed as one run.
+        run = None
+        cycles = 0
+        try:
+            for delay, steps_a, steps_b, count in moves:
+                if run is not None and delay == run[0] and steps_a == run[1] and steps_b == run[2]:
+                    cycles += count
+                    continue
+                if run is not None:
+                    execute(*run, cycles)
+                run = (delay, steps_a, steps_b)
+                cycles = count
+        finally:
+            if run is not None:
+                execute(*run, cycles)
+            self._stepper_a._position, self._stepper_b._position = positions
+        if any(last_excess):
+            # The motors come to rest at the end of the segment, which they cannot do instantly above the start rate.
+            segment.at_risk = True
+        self._time = base + run_delay * run_count
+        segment.end_time = self._time
+        segment.end = self.get_position()
+        self._segments.append(segment)
+        if not self._record_steps:
+            self._trajectory.extend((self._time, *segment.end))
@@ -0,0 +1,312 @@
+import heapq
+import threading
+from collections import deque
+from time import monotonic
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from ..gpio import InputPin, OutputPin, PWMPin, RPi4
+
+
+class MachineStats:
+    """
+    Throughput statistics for one machine run by a MachineManager.
+
+    Attributes:
+        pulses (int): Number of step phases executed.
+        segments (int): Number of pulse streams completed.
+        busy_time (float): Time in seconds spent executing pulse streams.
+        errors (int): Number of pulse streams abandoned because they raised.
+        last_error (Exception): The most recent exception raised by a pulse stream, or None.
+    """
+
+    def __init__(self):
+        self.pulses = 0
+        self.segments = 0
+        self.busy_time = 0.0
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
+
+    def pulses_per_second(self) -> float:
+        """
+        Returns:
+            float: Pulses executed per second of busy time.
+        """
+        return self.pulses / self.busy_time if self.busy_time > 0 else 0.0
+
+
+class _MachineState:
+    """
+    Queue and scheduling state of one machine.
+    """
+
+    def __init__(self, name: str, machine: object):
+        self.name = name
+        self.machine = machine
+        self.queue: Deque[Iterator[float]] = deque()
+        self.current: Optional[Iterator[float]] = None
+        # Set when the loop executes the first pulse of the current stream.
+        self.segment_start: Optional[float] = None
+        self.stats = MachineStats()
+
+
+class MachineManager:
+    """
+    Runs several independent machines from one process.
+
+    The manager allocates GPIO pins to machines, refusing to hand out a pin twice, and gives every
+    machine its own queue of pulse streams (e.g. CoreXY.move_x_pulses or StepperDriver.step_pulses).
+    A single timing loop interleaves the pulses of all machines by deadline, so each machine keeps
+    its own timing and total throughput grows with the number of machines. A stream that raises is
+    abandoned and recorded in its machine's stats, and the other machines keep running.
+    """
+
+    DEFAULT_MAX_LAG = 0.0005
+
+    def __init__(self, board=RPi4, max_lag: float = DEFAULT_MAX_LAG):
+        """
+        Initializes the machine manager.
+
+        Args:
+            board (optional): The GPIO interface used to create pins. Defaults to RPi4.
+            max_lag (float, optional): If the loop falls behind, a machine's next deadline trails the clock
+                by at most this many seconds, so it catches up gradually instead of bursting pulses
+                faster than its delay function allows. Defaults to 0.5 milliseconds.
+        """
+        self._board = board
+        self._max_lag = max_lag
+        self._pins: Dict[int, str] = {}
+        self._machines: Dict[str, _MachineState] = {}
+        self._deadlines: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def _allocate(self, owner: str, pin: int):
+        with self._condition:
+            if pin in self._pins:
+                raise ValueError(f'Pin {pin} is already allocated to {self._pins[pin]}.')
+            self._pins[pin] = owner
+
+    def output_pin(self, owner: str, pin: int) -> OutputPin:
+        """
+        Allocates an output pin.
+
+        Args:
+            owner (str): Name of the machine the pin belongs to.
+            pin (int): The pin number.
+
+        Returns:
+            OutputPin: An output pin.
+
+        Raises:
+            ValueError: If the pin is already allocated.
+        """
+        self._allocate(owner, pin)
+        return self._board.output_pin(pin)
+
+    def input_pin(self, owner: str, pin: int) -> InputPin:
+        """
+        Allocates an input pin.
+
+        Args:
+            owner (str): Name of the machine the pin belongs to.
+            pin (int): The pin number.
+
+        Returns:
+            InputPin: An input pin.
+
+        Raises:
+            ValueError: If the pin is already allocated.
+        """
+        self._allocate(owner, pin)
+        return self._board.input_pin(pin)
+
+    def pwm_pin(self, owner: str, pin: int, frequency: int) -> PWMPin:
+        """
+        Allocates a PWM pin.
+
+        Args:
+            owner (str): Name of the machine the pin belongs to.
+            pin (int): The pin number.
+            frequency (int): The initial frequency.
+
+        Returns:
+            PWMPin: A PWM pin.
+
+        Raises:
+            ValueError: If the pin is already allocated.
+        """
+        self._allocate(owner, pin)
+        return self._board.pwm_pin(pin, frequency)
+
+    def get_pin_owner(self, pin: int) -> Optional[str]:
+        """
+        Args:
+            pin (int): The pin number.
+
+        Returns:
+            str: Name of the machine the pin is allocated to, or None if it is free.
+        """
+        with self._condition:
+            return self._pins.get(pin)
+
+    def release_pins(self, owner: str):
+        """
+        Frees every pin allocated to a machine.
+
+        Args:
+            owner (str): Name of the machine.
+        """
+        with self._condition:
+            self._pins = {pin: name for pin, name in self._pins.items() if name != owner}
+
+    def add_machine(self, name: str, machine: object):
+        """
+        Registers a machine with its own pulse stream queue.
+
+        Args:
+            name (str): Unique name of the machine.
+            machine (object): The machine, e.g. a CoreXY.
+
+        Raises:
+            ValueError: If a machine with the same name is already registered.
+        """
+        with self._condition:
+            if name in self._machines:
+                raise ValueError(f'Machine {name} is already registered.')
+            self._machines[name] = _MachineState(name, machine)
+
+    def get_machine(self, name: str) -> object:
+        """
+        Args:
+            name (str): Name of the machine.
+
+        Returns:
+            object: The machine registered under the name.
+        """
+        return self._machines[name].machine
+
+    def submit(self, name: str, pulses: Iterator[float]):
+        """
+        Queues a pulse stream for a machine. Streams of one machine run in the order they were submitted.
+
+        Args:
+            name (str): Name of the machine.
+            pulses (Iterator[float]): The pulse stream, e.g. corexy.move_x_pulses(100).
+        """
+        with self._condition:
+            state = self._machines[name]
+            state.queue.append(pulses)
+            if state.current is None:
+                self._start_next(state, monotonic())
+            self._condition.notify_all()
+
+    def get_stats(self, name: str) -> MachineStats:
+        """
+        Args:
+            name (str): Name of the machine.
+
+        Returns:
+            MachineStats: Throughput statistics of the machine.
+        """
+        return self._machines[name].stats
+
+    def is_idle(self, name: str = None) -> bool:
+        """
+        Args:
+            name (str, optional): Name of the machine. Checks every machine if None.
+
+        Returns:
+            bool: True if the machine (or every machine) has no pulse streams left to run.
+        """
+        with self._condition:
+            if name is not None:
+                return self._machines[name].current is None
+            return not self._deadlines
+
+    def wait(self, name: str = None, timeout: float = None) -> bool:
+        """
+        Blocks until a machine (or every machine) is idle. Requires the loop to be running in the background.
+
+        Args:
+            name (str, optional): Name of the machine. Waits for every machine if None.
+            timeout (float, optional): Maximum time to wait in seconds. Waits indefinitely if None.
+
+        Returns:
+            bool: True if the machine became idle, False if the timeout expired.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.is_idle(name), timeout)
+
+    def start(self):
+        """
+        Starts running the timing loop on a background thread.
+        """
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run_background, daemon=True)
+                self._thread.start()
+
+    def run(self):
+        """
+        Runs the timing loop on the calling thread until every machine is idle.
+        """
+        self._loop(True)
+
+    def _start_next(self, state: _MachineState, now: float):
+        """
+        Starts the next queued stream of a machine, if any. Must be called while holding the lock.
+        """
+        if not state.queue:
+            state.current = None
+            return
+        state.current = state.queue.popleft()
+        state.segment_start = None
+        self._push(now, state.name)
+
+    def _push(self, deadline: float, name: str):
+        self._sequence += 1
+        heapq.heappush(self._deadlines, (deadline, self._sequence, name))
+
+    def _run_background(self):
+        try:
+            self._loop(False)
+        finally:
+            with self._condition:
+                self._thread = None
+
+    def _loop(self, stop_when_idle: bool):
+        with self._condition:
+            while True:
+                if not self._deadlines:
+                    if stop_when_idle:
+                        return
+                    self._condition.wait()
+                    continue
+                remaining = self._deadlines[0][0] - monotonic()
+                if remaining > 0:
+                    # Waiting on the condition lets newly submitted streams start without waiting for this deadline.
+                    self._condition.wait(remaining)
+                    continue
+                deadline, _, name = heapq.heappop(self._deadlines)
+                state = self._machines[name]
+                now = monotonic()
+                if state.segment_start is None:
+                    state.segment_start = now
+                try:
+                    delay = next(state.current)
+                except StopIteration:
+                    delay = None
+                    state.stats.segments += 1
+                except Exception as error:
+                    # Abandon the failing stream only, the other machines keep running.
+                    delay = None
+                    state.stats.errors += 1
+                    state.stats.last_error = error
+                if delay is None:
+                    state.stats.busy_time += now - state.segment_start
+                    self._start_next(state, now)
+                    self._condition.notify_all()
+                    continue
+                state.stats.pulses += 1
+                self._push(max(deadline, now - self._max_lag) + delay, name)
@@ -1 +1,3 @@
 from .CoreXY import CoreXY
+from .MachineManager import MachineManager, MachineStats
+from .CoreXYSimulator import CoreXYSimulator, SimulatedStepperDriver, SimulatedSegment
@@ -0,0 +1,197 @@
+import threading
+from time import monotonic, sleep
+from typing import Callable, Dict, List, Optional
+
+
+class Completion:
+    """
+    Handle for an operation that finishes in the background.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def done(self) -> bool:
+        """
+        Checks if the operation has finished.
+
+        Returns:
+            bool: True if the operation has finished, False otherwise.
+        """
+        return self._event.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Blocks until the operation has finished.
+
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds. Waits indefinitely if None.
+
+        Returns:
+            bool: True if the operation has finished, False if the timeout expired.
+        """
+        return self._event.wait(timeout)
+
+    def complete(self):
+        """
+        Marks the operation as finished and releases any waiters.
+        """
+        self._event.set()
+
+
+class TickScheduler:
+    """
+    Runs periodic update tasks for many devices from a single background thread.
+
+    A task is a callable that takes the time in seconds elapsed since the previous tick and
+    returns True while it still has work to do. Tasks that return False are dropped until
+    they are added again. A task that raises is dropped as well, so a single failing device
+    cannot stop the others sharing the scheduler.
+    """
+
+    DEFAULT_RATE = 100
+
+    _default: Optional['TickScheduler'] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, rate: float = DEFAULT_RATE, background: bool = True):
+        """
+        Initializes the scheduler.
+
+        Args:
+            rate (float, optional): Number of ticks per second. Defaults to 100.
+            background (bool, optional): If True, a daemon thread is started on demand to call tick.
+                If False, the caller is responsible for calling tick. Defaults to True.
+        """
+        self._interval = 1.0 / rate
+        self._background = background
+        self._tasks: List[Callable[[float], bool]] = []
+        self._error_handlers: Dict[Callable[[float], bool], Callable[[Exception], None]] = {}
+        self._last_error: Optional[Exception] = None
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def default() -> 'TickScheduler':
+        """
+        Returns the scheduler shared by devices that are not given one explicitly.
+
+        Returns:
+            TickScheduler: The shared scheduler.
+        """
+        with TickScheduler._default_lock:
+            if TickScheduler._default is None:
+                TickScheduler._default = TickScheduler()
+            return TickScheduler._default
+
+    def get_interval(self) -> float:
+        """
+        Gets the nominal time between ticks.
+
+        Returns:
+            float: The tick interval in seconds.
+        """
+        return self._interval
+
+    def get_last_error(self) -> Optional[Exception]:
+        """
+        Gets the most recent exception raised by a task.
+
+        Returns:
+            Exception: The exception, or None if no task has failed.
+        """
+        return self._last_error
+
+    def add(self, task: Callable[[float], bool], on_error: Callable[[Exception], None] = None):
+        """
+        Adds a task to the scheduler. Adding a task that is already scheduled has no effect.
+
+        Args:
+            task (Callable[[float], bool]): The task to run on every tick.
+            on_error (callable, optional): Called with the exception if the task raises, after the task
+                has been dropped, e.g. to release waiters. Defaults to None.
+        """
+        with self._condition:
+            if task not in self._tasks:
+                self._tasks.append(task)
+            if on_error is not None:
+                self._error_handlers[task] = on_error
+            if self._background and self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def remove(self, task: Callable[[float], bool]):
+        """
+        Removes a task from the scheduler.
+
+        Args:
+            task (Callable[[float], bool]): The task to remove.
+        """
+        with self._condition:
+            if task in self._tasks:
+                self._tasks.remove(task)
+            self._error_handlers.pop(task, None)
+
+    def is_idle(self) -> bool:
+        """
+        Checks if the scheduler has no tasks left.
+
+        Returns:
+            bool: True if no tasks are scheduled, False otherwise.
+        """
+        with self._condition:
+            return not self._tasks
+
+    def tick(self, dt: float = None):
+        """
+        Runs every scheduled task once.
+
+        Tasks are run while holding the scheduler lock, so a task added from another thread
+        is never lost to a concurrent removal. A task that raises is dropped and its error
+        handler is called, and the remaining tasks still run.
+
+        Args:
+            dt (float, optional): Elapsed time in seconds passed to each task. Defaults to the tick interval.
+        """
+        if dt is None:
+            dt = self._interval
+        with self._condition:
+            for task in list(self._tasks):
+                try:
+                    active = task(dt)
+                except Exception as error:
+                    self._last_error = error
+                    if task in self._tasks:
+                        self._tasks.remove(task)
+                    handler = self._error_handlers.pop(task, None)
+                    if handler is not None:
+                        try:
+                            handler(error)
+                        except Exception as handler_error:
+                            self._last_error = handler_error
+                    continue
+                if not active and task in self._tasks:
+                    self._tasks.remove(task)
+                    self._error_handlers.pop(task, None)
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            with self._condition:
+                self._thread = None
+
+    def _loop(self):
+        last_tick = monotonic()
+        while True:
+            with self._condition:
+                if not self._tasks:
+                    self._condition.wait_for(lambda: self._tasks)
+                    last_tick = monotonic()
+            delay = last_tick + self._interval - monotonic()
+            if delay > 0:
+                sleep(delay)
+            now = monotonic()
+            self.tick(now - last_tick)
+            last_tick = now
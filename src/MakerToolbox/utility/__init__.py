@@ -1 +1,2 @@
 from .DiscreteVector import DiscreteVector
+from .TickScheduler import TickScheduler, Completion
@@ -0,0 +1,102 @@
+import math
+
+import pytest
+
+from MakerToolbox.machines import CoreXYSimulator
+from MakerToolbox.utility import DiscreteVector
+
+
+@pytest.mark.parametrize('method, args, position', [
+    ('move_x', (10,), (10, 0)),
+    ('move_x', (-10,), (-10, 0)),
+    ('move_y', (7,), (0, 7)),
+    ('move_y', (-7,), (0, -7)),
+    ('move_diagonally', (5, 1, 1), (5, 5)),
+    ('move_diagonally', (5, 1, -1), (5, -5)),
+    ('move_diagonally', (5, -1, 1), (-5, 5)),
+    ('move_diagonally', (5, -1, -1), (-5, -5)),
+])
+def test_move_ends_at_cartesian_position(method, args, position):
+    simulator = CoreXYSimulator()
+    getattr(simulator, method)(*args)
+    assert simulator.get_position() == position
+
+
+def test_duration_is_exact_sum_of_delays():
+    simulator = CoreXYSimulator()
+    simulator.move_x(1000)
+    simulator.move_y(-500, lambda current, total: 0.001)
+    # Two phases per step.
+    assert simulator.get_time() == 1000 * 2 * 0.003 + 500 * 2 * 0.001
+    segments = simulator.get_segments()
+    assert [segment.method for segment in segments] == ['move_x', 'move_y']
+    assert segments[1].start == (1000, 0)
+    assert segments[1].end == (1000, -500)
+
+
+def test_trajectory_has_one_point_per_segment():
+    simulator = CoreXYSimulator()
+    simulator.move_x(10)
+    simulator.move_y(10)
+    assert list(simulator.get_trajectory()) == [0, 0, 0, 0.06, 10, 0, 0.12, 10, 10]
+
+
+def test_fast_start_is_flagged_and_slow_move_is_not():
+    simulator = CoreXYSimulator()
+    simulator.move_x(100)
+    simulator.move_x(100, lambda current, total: 0.0001)
+    slow, fast = simulator.get_segments()
+    assert not slow.at_risk
+    assert fast.at_risk
+    assert simulator.get_risky_segments() == [fast]
+
+
+def _ramp(start_rate: float, acceleration: float):
+    """
+    Delay function that accelerates from the start rate over the first half of a move and decelerates
+    back to it over the second half.
+    """
+    def delay_func(current: int, total: int) -> float:
+        rate = math.sqrt(start_rate ** 2 + 2 * acceleration * min(current, total - 1 - current))
+        # Two phases per step.
+        return 1 / (2 * rate)
+    return delay_func
+
+
+@pytest.mark.parametrize('start_rate, acceleration, steps', [
+    # Crosses the start rate of 250 steps per second at a gentle acceleration.
+    (240, 250, 80),
+    (200, 3000, 200),
+])
+def test_legal_ramp_is_not_flagged(start_rate, acceleration, steps):
+    simulator = CoreXYSimulator()
+    simulator.move_x(steps, _ramp(start_rate, acceleration))
+    segment, = simulator.get_segments()
+    assert segment.peak_step_rate > 250
+    assert not segment.at_risk
+
+
+def test_reversal_at_speed_is_flagged():
+    simulator = CoreXYSimulator()
+    simulator.follow_path([DiscreteVector(1, 0, 0)] * 600, _ramp(200, 1000))
+    simulator.follow_path([DiscreteVector(1, 0, 0)] * 300 + [DiscreteVector(-1, 0, 0)] * 300, _ramp(200, 1000))
+    straight, reversing = simulator.get_segments()
+    assert straight.peak_step_rate > 750
+    assert not straight.at_risk
+    assert reversing.at_risk
+
+
+def test_stop_at_speed_is_flagged():
+    simulator = CoreXYSimulator()
+    ramp = _ramp(200, 3000)
+    simulator.move_x(200, lambda current, total: ramp(min(current, total // 2), total))
+    assert simulator.get_segments()[0].at_risk
+
+
+def test_replay_reproduces_the_job():
+    simulator = CoreXYSimulator()
+    simulator.run(lambda machine: (machine.move_x(20), machine.move_diagonally(3, -1, 1)))
+    replayed = CoreXYSimulator()
+    simulator.replay(replayed)
+    assert replayed.get_position() == simulator.get_position() == (17, 3)
+    assert replayed.get_time() == simulator.get_time()
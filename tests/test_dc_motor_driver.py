@@ -0,0 +1,66 @@
+from MakerToolbox.hardware import DCMotorDriver
+from MakerToolbox.utility import TickScheduler
+
+
+class RecordingPin:
+
+    def __init__(self, name: str, calls: list):
+        self._name = name
+        self._calls = calls
+
+    def __getattr__(self, method):
+        return lambda *args: self._calls.append((self._name, method, *args))
+
+
+def _driver(**kwargs):
+    calls = []
+    driver = DCMotorDriver(
+        RecordingPin('pwm', calls),
+        RecordingPin('a', calls),
+        RecordingPin('b', calls),
+        **kwargs
+    )
+    calls.clear()
+    return driver, calls
+
+
+def test_repeated_set_speed_skips_redundant_writes():
+    driver, calls = _driver()
+    driver.set_speed(0.8)
+    driver.set_speed(0.8)
+    driver.set_speed(0.3)
+    driver.set_speed(-0.3)
+    assert calls == [
+        ('a', 'low'), ('b', 'high'), ('pwm', 'change_duty_cycle', 80.0),
+        ('pwm', 'change_duty_cycle', 30.0),
+        ('a', 'high'), ('b', 'low'),
+    ]
+
+
+def test_ramp_changes_speed_by_acceleration_times_dt():
+    scheduler = TickScheduler(background=False)
+    driver, calls = _driver(acceleration=2, scheduler=scheduler)
+    driver.set_speed(0.2)
+    calls.clear()
+    completion = driver.set_target_speed(0.7)
+    speeds = []
+    while not scheduler.is_idle():
+        scheduler.tick(0.1)
+        speeds.append(round(driver.get_speed(), 9))
+    assert speeds == [0.4, 0.6, 0.7]
+    assert completion.done()
+    assert [call[1] for call in calls] == ['change_duty_cycle'] * 3
+
+
+def test_ramp_through_zero_stops_instead_of_reversing_on_noise():
+    scheduler = TickScheduler(background=False)
+    driver, calls = _driver(acceleration=2, scheduler=scheduler)
+    driver.set_speed(0.6)
+    calls.clear()
+    driver.set_target_speed(-0.5)
+    while not scheduler.is_idle():
+        scheduler.tick(0.1)
+    stop = calls.index(('a', 'low'))
+    assert calls[stop:stop + 3] == [('a', 'low'), ('b', 'low'), ('pwm', 'change_duty_cycle', 0)]
+    assert calls.count(('a', 'high')) == 1
+    assert driver.get_speed() == -0.5
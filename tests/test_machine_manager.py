@@ -0,0 +1,52 @@
+from time import sleep
+
+import pytest
+
+from MakerToolbox.machines import MachineManager
+
+
+def _pulses(count: int, delay: float):
+    for _ in range(count):
+        yield delay
+
+
+def _failing_pulses():
+    yield 0.001
+    raise RuntimeError('driver fault')
+
+
+def test_pin_conflicts_are_rejected():
+    manager = MachineManager()
+    manager.output_pin('left', 2)
+    with pytest.raises(ValueError):
+        manager.output_pin('right', 2)
+    assert manager.get_pin_owner(2) == 'left'
+    manager.release_pins('left')
+    manager.output_pin('right', 2)
+
+
+def test_failing_stream_does_not_stop_other_machines():
+    manager = MachineManager()
+    manager.add_machine('broken', object())
+    manager.add_machine('healthy', object())
+    manager.submit('broken', _failing_pulses())
+    manager.submit('broken', _pulses(5, 0.001))
+    manager.submit('healthy', _pulses(20, 0.001))
+    manager.start()
+    assert manager.wait(timeout=2)
+    broken = manager.get_stats('broken')
+    assert broken.errors == 1
+    assert isinstance(broken.last_error, RuntimeError)
+    assert broken.segments == 1
+    assert manager.get_stats('healthy').pulses == 20
+
+
+def test_busy_time_excludes_time_before_the_loop_runs():
+    manager = MachineManager()
+    manager.add_machine('rig', object())
+    manager.submit('rig', _pulses(50, 0.001))
+    sleep(0.2)
+    manager.run()
+    stats = manager.get_stats('rig')
+    assert stats.segments == 1
+    assert 0.04 <= stats.busy_time < 0.15
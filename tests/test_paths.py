@@ -0,0 +1,108 @@
+from math import comb, cos, hypot, sin
+
+import pytest
+
+from MakerToolbox.algorithms import compute_discrete_arc_differentials, compute_discrete_bezier_differentials
+from MakerToolbox.machines import CoreXYSimulator
+from MakerToolbox.utility import DiscreteVector
+
+
+def _walk(start, differentials):
+    x, y, z = start.x, start.y, start.z
+    positions = []
+    for differential in differentials:
+        assert max(abs(differential.x), abs(differential.y), abs(differential.z)) == 1
+        x, y, z = x + differential.x, y + differential.y, z + differential.z
+        positions.append((x, y, z))
+    return positions
+
+
+@pytest.mark.parametrize('radius', [1, 2, 3, 10, 57])
+@pytest.mark.parametrize('clockwise', [False, True])
+def test_full_circle_returns_to_start_within_one_unit(radius, clockwise):
+    start = DiscreteVector(radius, 0, 0)
+    positions = _walk(start, compute_discrete_arc_differentials(start, start, DiscreteVector(0, 0, 0), clockwise))
+    assert positions[-1] == (radius, 0, 0)
+    assert len(set(positions)) == len(positions)
+    assert max(abs(hypot(x, y) - radius) for x, y, _ in positions) <= 1
+
+
+def test_radius_one_quarter_arc_goes_straight_to_the_end():
+    start = DiscreteVector(1, 0, 0)
+    positions = _walk(start, compute_discrete_arc_differentials(start, DiscreteVector(0, 1, 0), DiscreteVector(0, 0, 0)))
+    assert positions == [(1, 1, 0), (0, 1, 0)]
+
+
+def test_radius_two_circle_stays_on_the_circle():
+    start = DiscreteVector(2, 0, 0)
+    positions = _walk(start, compute_discrete_arc_differentials(start, start, DiscreteVector(0, 0, 0)))
+    assert len(positions) == 12
+    assert max(abs(hypot(x, y) - 2) for x, y, _ in positions) < 0.5
+
+
+@pytest.mark.parametrize('start_angle, end_angle', [(0.3, 2.0), (2.0, 0.3), (1.0, 5.5), (4.0, 4.2)])
+@pytest.mark.parametrize('clockwise', [False, True])
+def test_arc_reaches_end_within_one_unit(start_angle, end_angle, clockwise):
+    center = DiscreteVector(7, -3, 2)
+    radius = 200
+    start = DiscreteVector(center.x + round(radius * cos(start_angle)), center.y + round(radius * sin(start_angle)), 2)
+    end = DiscreteVector(center.x + round(radius * cos(end_angle)), center.y + round(radius * sin(end_angle)), 2)
+    start_radius = hypot(start.x - center.x, start.y - center.y)
+    positions = _walk(start, compute_discrete_arc_differentials(start, end, center, clockwise))
+    assert positions[-1] == (end.x, end.y, 2)
+    assert max(abs(hypot(x - center.x, y - center.y) - start_radius) for x, y, _ in positions) <= 1
+
+
+def test_arc_rejects_mismatched_radius():
+    with pytest.raises(ValueError):
+        list(compute_discrete_arc_differentials(
+            DiscreteVector(10, 0, 0), DiscreteVector(0, 20, 0), DiscreteVector(0, 0, 0)
+        ))
+
+
+def _bezier(points, t):
+    n = len(points) - 1
+    return [
+        sum(comb(n, i) * (1 - t) ** (n - i) * t ** i * getattr(points[i], axis) for i in range(n + 1))
+        for axis in 'xyz'
+    ]
+
+
+@pytest.mark.parametrize('control_points', [
+    [DiscreteVector(0, 0, 0), DiscreteVector(100, 300, 0), DiscreteVector(300, 0, 0)],
+    [DiscreteVector(-50, 20, 0), DiscreteVector(400, 400, 3), DiscreteVector(-300, 300, -3), DiscreteVector(200, -100, 0)],
+])
+def test_bezier_reaches_end_within_tolerance(control_points):
+    tolerance = 0.5
+    start, end = control_points[0], control_points[-1]
+    positions = _walk(start, compute_discrete_bezier_differentials(control_points, tolerance))
+    assert positions[-1] == (end.x, end.y, end.z)
+    samples = [_bezier(control_points, i / 4000) for i in range(4001)]
+    for x, y, z in positions[::5]:
+        distance = min(hypot(x - sx, y - sy, z - sz) for sx, sy, sz in samples)
+        assert distance <= tolerance + 1
+
+
+def test_bezier_rejects_other_degrees():
+    with pytest.raises(ValueError):
+        list(compute_discrete_bezier_differentials([DiscreteVector(0, 0, 0), DiscreteVector(1, 1, 0)]))
+
+
+@pytest.mark.parametrize('dx, dy', [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy])
+def test_follow_path_maps_each_unit_step(dx, dy):
+    simulator = CoreXYSimulator()
+    simulator.follow_path([DiscreteVector(dx, dy, 0)] * 3)
+    assert simulator.get_position() == (3 * dx, 3 * dy)
+
+
+def test_follow_path_rejects_z_steps():
+    with pytest.raises(ValueError):
+        CoreXYSimulator().follow_path([DiscreteVector(0, 0, 1)])
+
+
+def test_follow_path_over_an_arc():
+    simulator = CoreXYSimulator()
+    start = DiscreteVector(100, 0, 0)
+    simulator.follow_path(compute_discrete_arc_differentials(start, DiscreteVector(-100, 0, 0), DiscreteVector(0, 0, 0)))
+    assert simulator.get_position() == (-200, 0)
+    assert not simulator.get_risky_segments()
@@ -0,0 +1,83 @@
+from time import sleep
+
+import pytest
+
+from MakerToolbox.gpio import PWMMultiplexer
+
+
+class RecordingOutputPin:
+
+    def __init__(self, pin: int):
+        self.pin = pin
+        self.values = []
+
+    def high(self):
+        self.values.append(True)
+
+    def low(self):
+        self.values.append(False)
+
+    def set(self, value: bool):
+        self.values.append(value)
+
+
+def _multiplexer(**kwargs):
+    outputs = {}
+
+    def output_pin(pin: int) -> RecordingOutputPin:
+        outputs[pin] = RecordingOutputPin(pin)
+        return outputs[pin]
+
+    return PWMMultiplexer(100, output_pin, **kwargs), outputs
+
+
+def test_schedule_orders_falling_edges_by_duty_cycle():
+    schedules = []
+    multiplexer, _ = _multiplexer(backend=lambda period, schedule: schedules.append((period, schedule)))
+    for pin, duty_cycle in ((5, 50), (6, 10), (7, 75)):
+        multiplexer.channel(pin).start(duty_cycle)
+    assert multiplexer.get_schedule() == [
+        (0.0, [5, 6, 7], True),
+        (pytest.approx(0.001), [6], False),
+        (pytest.approx(0.005), [5], False),
+        (pytest.approx(0.0075), [7], False),
+    ]
+    assert len(schedules) == 3
+    assert schedules[-1] == (0.01, multiplexer.get_schedule())
+
+
+def test_close_edges_are_merged_midway():
+    multiplexer, _ = _multiplexer(resolution=0.0001, backend=lambda period, schedule: None)
+    for pin, duty_cycle in ((5, 50), (6, 50.6), (7, 51.2), (8, 51.5)):
+        multiplexer.channel(pin).start(duty_cycle)
+    # Edges are merged within 100 microseconds of the first edge of their group.
+    assert multiplexer.get_schedule()[1:] == [
+        (pytest.approx(0.00503), [5, 6], False),
+        (pytest.approx(0.005135), [7, 8], False),
+    ]
+
+
+def test_constant_channels_are_not_switched_within_the_period():
+    multiplexer, _ = _multiplexer(backend=lambda period, schedule: None)
+    multiplexer.channel(5).start(0)
+    multiplexer.channel(6).start(100)
+    multiplexer.channel(7).start(30)
+    assert multiplexer.get_schedule() == [
+        (0.0, [6, 7], True),
+        (0.0, [5], False),
+        (pytest.approx(0.003), [7], False),
+    ]
+
+
+def test_stop_pulls_the_pin_low_and_ends_the_timing_loop():
+    multiplexer, outputs = _multiplexer()
+    channel = multiplexer.channel(5)
+    channel.start(50)
+    sleep(0.05)
+    assert multiplexer._thread is not None
+    assert True in outputs[5].values
+    channel.stop()
+    sleep(0.05)
+    assert outputs[5].values[-1] is False
+    assert multiplexer._thread is None
+    assert multiplexer.get_schedule() == []
@@ -0,0 +1,55 @@
+from MakerToolbox.hardware import ServoMotor, ServoGroup
+from MakerToolbox.utility import TickScheduler
+
+
+class FakePWMPin:
+
+    def __init__(self):
+        self.duty_cycles = []
+
+    def start(self, duty_cycle: float):
+        self.duty_cycles.append(duty_cycle)
+
+    def change_duty_cycle(self, duty_cycle: float):
+        self.duty_cycles.append(duty_cycle)
+
+
+def test_group_sweep_reaches_every_angle_before_completing():
+    scheduler = TickScheduler(background=False)
+    servos = [ServoMotor(FakePWMPin(), scheduler=scheduler) for _ in range(3)]
+    group = ServoGroup(servos, scheduler=scheduler)
+    group.set_angles([0, 0, 0], delay=0)
+    scheduler.tick()
+    completion = group.sweep_to([90, 45, 180], duration=0.1)
+    # A second command while the group task is scheduled replaces the first one.
+    completion = group.sweep_to([30, 60, 90], duration=0.1)
+    scheduler.tick()
+    assert not completion.done()
+    while not scheduler.is_idle():
+        scheduler.tick()
+    assert completion.done()
+    assert [servo.get_angle() for servo in servos] == [30, 60, 90]
+
+
+def test_duplicate_duty_cycles_are_not_written():
+    scheduler = TickScheduler(background=False)
+    pwm = FakePWMPin()
+    servo = ServoMotor(pwm, scheduler=scheduler)
+    servo.set_angle(90)
+    servo.set_angle(90)
+    assert pwm.duty_cycles == [7.5]
+
+
+def test_group_set_angles_replaces_running_sweep():
+    scheduler = TickScheduler(background=False)
+    pwms = [FakePWMPin(), FakePWMPin()]
+    group = ServoGroup([ServoMotor(pwm, scheduler=scheduler) for pwm in pwms], scheduler=scheduler)
+    group.set_angles([0, 0], delay=0)
+    sweep = group.sweep_to([180, 180], duration=1)
+    scheduler.tick()
+    completion = group.set_angles([90, 90], delay=0)
+    assert sweep.done()
+    while not scheduler.is_idle():
+        scheduler.tick()
+    assert completion.done()
+    assert [pwm.duty_cycles[-1] for pwm in pwms] == [7.5, 7.5]
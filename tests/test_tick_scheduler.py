@@ -0,0 +1,28 @@
+from MakerToolbox.hardware import DCMotorDriver
+from MakerToolbox.utility import TickScheduler
+
+
+class FakePin:
+
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+def _failing_measure():
+    raise OSError('encoder unplugged')
+
+
+def test_failing_task_is_dropped_and_other_tasks_keep_running():
+    scheduler = TickScheduler(background=False)
+    failing = DCMotorDriver(FakePin(), FakePin(), FakePin(), acceleration=1, scheduler=scheduler)
+    healthy = DCMotorDriver(FakePin(), FakePin(), FakePin(), acceleration=10, scheduler=scheduler)
+    failing_completion = failing.set_target_speed(0.5)
+    failing.set_feedback(_failing_measure)
+    healthy_completion = healthy.set_target_speed(1)
+    for _ in range(20):
+        scheduler.tick(0.01)
+    assert isinstance(scheduler.get_last_error(), OSError)
+    assert failing_completion.done()
+    assert healthy_completion.done()
+    assert healthy.get_speed() == 1
+    assert scheduler.is_idle()